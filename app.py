@@ -1,73 +1,243 @@
 import io
+import itertools
 import os
 import datetime
+import hashlib
 import platform
+import posixpath
+import re
 import subprocess
-from typing import Tuple
+import threading
+import zipfile
+from collections import Counter
+from typing import Iterator, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
 
 import streamlit as st
 from docx import Document
 from docx.shared import Pt, Inches
-from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from docx.opc.constants import NAMESPACE as NS, RELATIONSHIP_TYPE as RT
 from docx.enum.style import WD_STYLE_TYPE
 
+try:  # optional: JIT-compiled sentence casing (pip install numba)
+    import numpy as np
+    from numba import njit, prange
+except ImportError:
+    np = njit = prange = None
+
+# -----------------------------
+# WordprocessingML names (resolved once, not per element)
+# -----------------------------
+_QN_BODY = qn("w:body")
+_QN_P = qn("w:p")
+_QN_PPR = qn("w:pPr")
+_QN_PSTYLE = qn("w:pStyle")
+_QN_R = qn("w:r")
+_QN_T = qn("w:t")
+_QN_BR = qn("w:br")
+_QN_TAB = qn("w:tab")
+_QN_PTAB = qn("w:ptab")
+_QN_CR = qn("w:cr")
+_QN_NO_BREAK_HYPHEN = qn("w:noBreakHyphen")
+_QN_HYPERLINK = qn("w:hyperlink")
+_QN_STYLE = qn("w:style")
+_QN_TYPE = qn("w:type")
+_QN_NAME = qn("w:name")
+_QN_VAL = qn("w:val")
+_QN_STYLE_ID = qn("w:styleId")
+_QN_DEFAULT = qn("w:default")
+_QN_RELATIONSHIP = "{%s}Relationship" % NS.OPC_RELATIONSHIPS
+
 # -----------------------------
 # Text helpers (same behavior)
 # -----------------------------
+# A sentence mark, any non-letters, then the first letter candidate; the text's
+# first candidate is matched separately. [^\W\d_] is every str.isalpha() letter
+# plus the non-decimal numerics (², ½, Ⅻ), so each hit is confirmed with isalpha().
+# Leading with a plain character class (no ^ alternative) lets re skip ahead
+# to the next mark instead of retrying the pattern at every position.
+_SENT_RE = re.compile(r'[.!?:][\W\d_]*[^\W\d_]')
+_FIRST_LETTER_RE = re.compile(r'[\W\d_]*[^\W\d_]')
+# The only characters str.lower() treats differently from lowering letter by letter:
+# Σ (final ς at a word end) and the non-letters it lowercases (Roman numerals,
+# circled letters). tests/test_text_helpers.py checks this against every code point.
+_LOWER_DIFF_RE = re.compile('[\u03a3\u2160-\u216f\u24b6-\u24cf]')
+
+def _capitalize_sentences(s: str) -> str:
+    # Upper-cases the first letter of the text and the first letter after each mark
+    parts = []
+    done = 0
+    m = _FIRST_LETTER_RE.match(s)
+    while m is not None:
+        i = m.end() - 1
+        if s[i].isalpha():
+            parts.append(s[done:i])
+            parts.append(s[i].upper())
+            done = i + 1
+            m = _SENT_RE.search(s, done)
+        else:
+            # A numeric, not a letter: keep looking in the same sentence
+            m = _FIRST_LETTER_RE.match(s, i + 1)
+    parts.append(s[done:])
+    return ''.join(parts)
+
+if njit is not None:
+    @njit(cache=True)
+    def _sentence_case_u8(buf):
+        # ASCII-only version of the regexes above, done in place on the bytes
+        cap_next = True
+        for i in range(buf.shape[0]):
+            c = buf[i]
+            if 0x41 <= c <= 0x5A:  # A-Z -> a-z
+                c += 32
+            if 0x61 <= c <= 0x7A:
+                if cap_next:
+                    c -= 32
+                    cap_next = False
+            elif c == 0x2E or c == 0x21 or c == 0x3F or c == 0x3A:  # . ! ? :
+                cap_next = True
+            buf[i] = c
+        return buf
+
+    @njit(parallel=True, cache=True)
+    def _sentence_case_u8_batch(buf, offsets):
+        # Many texts laid end to end in one buffer; each slice is cased independently
+        for k in prange(offsets.shape[0] - 1):
+            _sentence_case_u8(buf[offsets[k]:offsets[k + 1]])
+        return buf
+else:
+    _sentence_case_u8 = _sentence_case_u8_batch = None
+
 def to_sentence_case(text: str) -> str:
     s = (text or "")
-    lowered = ''.join(ch.lower() if ch.isalpha() else ch for ch in s)
-    chars = list(lowered)
-    n = len(chars)
-    cap_next = True
-    i = 0
-    while i < n:
-        ch = chars[i]
-        if cap_next and ch.isalpha():
-            chars[i] = ch.upper()
-            cap_next = False
-        elif ch in ('.', '!', '?', ':'):
-            cap_next = True
-        i += 1
-    return ''.join(chars)
+    if _sentence_case_u8 is not None and s.isascii():
+        buf = np.frombuffer(bytearray(s, "ascii"), np.uint8)
+        return _sentence_case_u8(buf).tobytes().decode("ascii")
+    if _LOWER_DIFF_RE.search(s) is None:
+        s = s.lower()
+    else:
+        s = ''.join(ch.lower() if ch.isalpha() else ch for ch in s)
+    return _capitalize_sentences(s)
+
+# Below this many texts, starting the parallel kernel costs more than it saves
+_BATCH_MIN = 256
+
+# Numba's fallback "workqueue" threading layer aborts the whole process when two
+# threads launch parallel kernels at once, and Streamlit runs each session on its
+# own thread. The lock has to be per process, not per script run (every rerun
+# gets fresh module globals), hence cache_resource.
+@st.cache_resource(show_spinner=False)
+def _parallel_kernel_lock() -> threading.Lock:
+    return threading.Lock()
+
+def to_sentence_case_batch(texts: list) -> list:
+    # Same result as [to_sentence_case(t) for t in texts]; with numba, the ASCII
+    # texts are cased together in one parallel kernel call. While another session
+    # holds the kernel, texts are cased one by one instead of waiting.
+    if _sentence_case_u8_batch is None or len(texts) < _BATCH_MIN:
+        return [to_sentence_case(t) for t in texts]
+    lock = _parallel_kernel_lock()
+    if not lock.acquire(blocking=False):
+        return [to_sentence_case(t) for t in texts]
+    try:
+        return _to_sentence_case_parallel(texts)
+    finally:
+        lock.release()
+
+def _to_sentence_case_parallel(texts: list) -> list:
+    result = [None if t.isascii() else to_sentence_case(t) for t in texts]
+    ascii_texts = [t for t in texts if t.isascii()]
+    offsets = [0, *itertools.accumulate(len(t) for t in ascii_texts)]
+    buf = np.frombuffer(bytearray("".join(ascii_texts), "ascii"), np.uint8)
+    cased = _sentence_case_u8_batch(buf, np.array(offsets, np.int64)).tobytes().decode("ascii")
+    k = 0
+    for i, r in enumerate(result):
+        if r is None:
+            result[i] = cased[offsets[k]:offsets[k + 1]]
+            k += 1
+    return result
+
+_TERMINAL = frozenset('.!?')
+_CLOSING_QUOTES = frozenset('"\'”’')
 
 def ensure_terminal_period(s: str) -> str:
     s = (s or "").rstrip()
     if not s:
         return s
-    terminal = {'.', '!', '?'}
-    closing_quotes = {'"', "'", '”', '’'}
     last = s[-1]
-    if last in terminal:
+    if last in _TERMINAL:
         return s
-    if last in closing_quotes:
-        if len(s) >= 2 and s[-2] in terminal:
+    if last in _CLOSING_QUOTES:
+        if len(s) >= 2 and s[-2] in _TERMINAL:
             return s
         return s[:-1] + '.' + last
     return s + '.'
 
 # -----------------------------
-# Layout helpers
+# Paragraph XML templates
 # -----------------------------
-def _set_xml_indent(para, left_twips: int, hanging_twips: int):
-    pPr = para._p.get_or_add_pPr()
-    for ind_node in pPr.xpath('./w:ind'):
-        pPr.remove(ind_node)
-    ind = OxmlElement('w:ind')
-    ind.set(qn('w:left'), str(left_twips))
-    ind.set(qn('w:hanging'), str(hanging_twips))
-    pPr.append(ind)
-
-def _add_visible_blank_line(doc: Document):
-    spacer = doc.add_paragraph("\u00A0")
-    spacer.paragraph_format.line_spacing = 1.0
-    spacer.paragraph_format.space_before = Pt(0)
-    spacer.paragraph_format.space_after = Pt(0)
+# One <w:p> per output role. Font, bold/underline and spacing all come from the
+# role's paragraph style (see ensure_output_styles), so runs carry no rPr.
+# The run's content comes from _run_xml.
+_PARAGRAPH_XML = '<w:p><w:pPr><w:pStyle w:val="%s"/>%s</w:pPr><w:r>%%s</w:r></w:p>'
+
+_HEADING_XML = _PARAGRAPH_XML % ("KPHeading", "")
+_SUBHEADING_XML = _PARAGRAPH_XML % ("KPSubheading", "")
+_BULLET_L2_XML = _PARAGRAPH_XML % ("KPBulletL2", "")
+# Indent: text 0.75" (1080 twips), hanging 0.25" (360) → bullet at 0.5".
+# Kept on the paragraph so it survives users re-picking H5Subbullet's bullet.
+_H5_BULLET_XML = _PARAGRAPH_XML % ("H5Subbullet", '<w:ind w:left="1080" w:hanging="360"/>')
+
+_RUN_SPLIT_RE = re.compile(r'([\t\r\n])')
+_RUN_BREAK_XML = {"\t": "<w:tab/>", "\r": "<w:br/>", "\n": "<w:br/>"}
+
+def _text_xml(text: str) -> str:
+    if not text:
+        return ""
+    if len(text.strip()) < len(text):
+        return '<w:t xml:space="preserve">%s</w:t>' % escape(text)
+    return '<w:t>%s</w:t>' % escape(text)
+
+def _run_xml(text: str) -> str:
+    # Same run content python-docx's add_run(text) writes: escaped w:t segments,
+    # with tabs as <w:tab/> and line breaks as <w:br/>
+    if "\t" not in text and "\n" not in text and "\r" not in text:
+        return _text_xml(text)
+    return "".join(_RUN_BREAK_XML.get(piece) or _text_xml(piece) for piece in _RUN_SPLIT_RE.split(text))
 
 # -----------------------------
 # Styles & renderers
 # -----------------------------
+# Gap after every output paragraph: one single-spaced line of Arial 10
+# (~1.15 x font size), in place of a separate blank paragraph.
+_PARAGRAPH_GAP = Pt(11.5)
+
+def _set_role_format(stl, bold=None, underline=None):
+    stl.font.name = "Arial"
+    stl.font.size = Pt(10)
+    stl.font.bold = bold
+    stl.font.underline = underline
+    pf = stl.paragraph_format
+    pf.line_spacing = 1.0
+    pf.space_before = Pt(0)
+    pf.space_after = _PARAGRAPH_GAP
+
+def ensure_output_styles(doc: Document):
+    styles = doc.styles
+    existing = {s.name for s in styles}
+    for name, base, bold, underline in (
+        ("KPHeading", "Normal", True, True),
+        ("KPSubheading", "Normal", False, True),
+        ("KPBulletL2", "List Bullet 2", None, None),
+    ):
+        if name not in existing:
+            stl = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+            stl.base_style = styles[base]
+            _set_role_format(stl, bold=bold, underline=underline)
+    ensure_h5_subbullet_style(doc)
+
 def ensure_h5_subbullet_style(doc: Document):
     styles = doc.styles
     if "H5Subbullet" not in [s.name for s in styles]:
@@ -76,71 +246,30 @@ def ensure_h5_subbullet_style(doc: Document):
             stl.base_style = styles["List Bullet 2"]
         except KeyError:
             stl.base_style = styles["List Bullet"]
-        stl.font.name = "Arial"
-        stl.font.size = Pt(10)
-        pf = stl.paragraph_format
-        pf.line_spacing = 1.0
-        pf.space_before = Pt(0)
-        pf.space_after = Pt(0)
-
-def add_heading(out: Document, text: str):
-    p = out.add_paragraph()
-    p.paragraph_format.line_spacing = 1.0
-    p.paragraph_format.space_before = Pt(0)
-    p.paragraph_format.space_after = Pt(0)
-    r = p.add_run((text or "").upper())
-    r.bold = True
-    r.underline = True
-    r.font.name = 'Arial'
-    r.font.size = Pt(10)
-    _add_visible_blank_line(out)
-
-def add_subheading_all_caps(out: Document, text: str):
-    p = out.add_paragraph()
-    p.paragraph_format.line_spacing = 1.0
-    p.paragraph_format.space_before = Pt(0)
-    p.paragraph_format.space_after = Pt(0)
-    r = p.add_run((text or "").upper())
-    r.bold = False
-    r.underline = True
-    r.font.name = 'Arial'
-    r.font.size = Pt(10)
-    _add_visible_blank_line(out)
-
-def add_bullet(out: Document, text: str, indent: bool = False, add_period=False):
-    formatted = to_sentence_case(text)
-    if add_period:
-        formatted = ensure_terminal_period(formatted)
-    style_name = 'List Bullet 2' if indent else 'List Bullet'
-    p = out.add_paragraph(formatted, style=style_name)
-    p.paragraph_format.line_spacing = 1.0
-    p.paragraph_format.space_before = Pt(0)
-    p.paragraph_format.space_after = Pt(0)
-    if p.runs:
-        r = p.runs[0]
-        r.font.name = 'Arial'
-        r.font.size = Pt(10)
-    _add_visible_blank_line(out)
-
-def add_h5_bullet(out: Document, text: str):
-    formatted = ensure_terminal_period(to_sentence_case(text))
-    p = out.add_paragraph(formatted, style='H5Subbullet')
-    p.paragraph_format.line_spacing = 1.0
-    p.paragraph_format.space_before = Pt(0)
-    p.paragraph_format.space_after = Pt(0)
-    if p.runs:
-        r = p.runs[0]
-        r.font.name = 'Arial'
-        r.font.size = Pt(10)
-    # Indent: text 0.75" (1080 twips), hanging 0.25" (360) → bullet at 0.5"
-    _set_xml_indent(p, left_twips=1080, hanging_twips=360)
-    _add_visible_blank_line(out)
-
-def guess_heading_level(style_name: str, text: str) -> int:
+        _set_role_format(stl)
+
+def add_heading(out, text: str):
+    out.append(_HEADING_XML % _run_xml((text or "").upper()))
+
+def add_subheading_all_caps(out, text: str):
+    out.append(_SUBHEADING_XML % _run_xml((text or "").upper()))
+
+# The bullet emitters take text that is already sentence-cased, so transform_docx
+# can case all bullets in one batch first. The two H4 variants are specialised on
+# add_period_to_h4 and picked once per transform.
+def _append_h4_bullet(out, cased: str):
+    out.append(_BULLET_L2_XML % _run_xml(cased))
+
+def _append_h4_bullet_with_period(out, cased: str):
+    out.append(_BULLET_L2_XML % _run_xml(ensure_terminal_period(cased)))
+
+def _append_h5_bullet(out, cased: str):
+    out.append(_H5_BULLET_XML % _run_xml(ensure_terminal_period(cased)))
+
+def style_heading_level(style_name: str) -> int:
+    # Substring match, so custom styles like "Heading 2 Custom" or "KP Heading 4"
+    # count too. The reader calls this once per style, not per paragraph.
     style = (style_name or "").lower().strip()
-    t = (text or "").strip()
-    if not t:
-        return 0
     if "heading 2" in style or style == "h2":
         return 1
     elif "heading 3" in style or style == "h3":
@@ -152,11 +281,120 @@ def guess_heading_level(style_name: str, text: str) -> int:
     return 0
 
 # -----------------------------
-# Core transform
+# Streaming source reader
 # -----------------------------
-def transform_docx(src: Document, add_period_to_h4: bool = True) -> Tuple[Document, dict]:
+# Run children other than w:t and w:br that python-docx's Run.text turns into text
+_RUN_CHARS = {_QN_TAB: "\t", _QN_PTAB: "\t", _QN_CR: "\n", _QN_NO_BREAK_HYPHEN: "-"}
+
+def _paragraph_text(p) -> str:
+    # Same text python-docx's Paragraph.text reads: direct runs and hyperlink runs,
+    # with w:t text, w:tab/w:ptab as "\t", line breaks as "\n" and non-breaking
+    # hyphens as "-". Page and column breaks add nothing.
+    # find/findall with a bare tag stay in C; iterfind and paths go through ElementPath.
+    texts = []
+    for child in p:
+        if child.tag == _QN_R:
+            runs = (child,)
+        elif child.tag == _QN_HYPERLINK:
+            runs = child.findall(_QN_R)
+        else:
+            continue
+        for r in runs:
+            for el in r:
+                tag = el.tag
+                if tag == _QN_T:
+                    texts.append(el.text or '')
+                elif tag == _QN_BR:
+                    if el.get(_QN_TYPE, "textWrapping") == "textWrapping":
+                        texts.append("\n")
+                elif tag in _RUN_CHARS:
+                    texts.append(_RUN_CHARS[tag])
+    return ''.join(texts)
+
+def _related_part(zf: zipfile.ZipFile, source: str, reltype: str):
+    # Zip member name of the part `source` relates to with `reltype` ("" for the
+    # package itself), or None. Part names are looked up through the _rels parts
+    # the way Document() resolves them, not assumed.
+    folder, name = posixpath.split(source)
+    try:
+        with zf.open(posixpath.join(folder, "_rels", name + ".rels")) as f:
+            rels = ElementTree.parse(f).getroot()
+    except KeyError:
+        return None
+    for rel in rels.iterfind(_QN_RELATIONSHIP):
+        if rel.get("Type") == reltype and rel.get("TargetMode") != "External":
+            return posixpath.normpath(posixpath.join("/" + folder, rel.get("Target", ""))).lstrip("/")
+    return None
+
+def _read_paragraph_style_levels(zf: zipfile.ZipFile, styles_part) -> dict:
+    # Raw styleId -> heading level, classified once per style rather than per
+    # paragraph; None maps to the document's default paragraph style.
+    levels = {}
+    if styles_part is None:
+        return levels
+    try:
+        with zf.open(styles_part) as f:
+            styles = ElementTree.parse(f).getroot()
+    except KeyError:
+        return levels
+    for stl in styles.iterfind(_QN_STYLE):
+        if stl.get(_QN_TYPE) != "paragraph":
+            continue
+        name_el = stl.find(_QN_NAME)
+        level = style_heading_level(name_el.get(_QN_VAL, "") if name_el is not None else "")
+        levels[stl.get(_QN_STYLE_ID)] = level
+        if stl.get(_QN_DEFAULT) in ("1", "true", "on"):
+            levels[None] = level
+    return levels
+
+def iter_source_paragraphs(src) -> Iterator[Tuple[int, str]]:
+    # Yields (heading level, text) for each body-level heading paragraph without
+    # building the full document tree; table-cell paragraphs are skipped like
+    # Document.paragraphs. The style is resolved first so that text is only
+    # collected for paragraphs that will be kept.
+    # ElementTree has no parent pointers, so nesting is tracked by depth instead
+    # (w:document = 1, w:body = 2, body children = 3).
+    with zipfile.ZipFile(src) as zf:
+        document_part = _related_part(zf, "", RT.OFFICE_DOCUMENT)
+        if document_part is None:
+            raise ValueError("not a Word document: no main document part")
+        style_levels = _read_paragraph_style_levels(zf, _related_part(zf, document_part, RT.STYLES))
+        default_level = style_levels.get(None, 0)
+        with zf.open(document_part) as stream:
+            depth = 0
+            body = None
+            for event, elem in ElementTree.iterparse(stream, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 2 and elem.tag == _QN_BODY:
+                        body = elem
+                    continue
+                depth -= 1
+                if depth != 2 or body is None:
+                    continue
+                if elem.tag == _QN_P:
+                    ppr = elem.find(_QN_PPR)
+                    pstyle = ppr.find(_QN_PSTYLE) if ppr is not None else None
+                    style_id = pstyle.get(_QN_VAL) if pstyle is not None else None
+                    level = style_levels.get(style_id, default_level) if style_id else default_level
+                    if level:
+                        yield level, _paragraph_text(elem)
+                # Drop each finished body child so memory stays O(one paragraph)
+                body.clear()
+
+# -----------------------------
+# Output package
+# -----------------------------
+_DOCUMENT_PART = "word/document.xml"
+
+# Streamlit re-executes this whole script on every rerun, so a module-level build
+# would redo it on each widget interaction; cache_resource keeps one per process.
+@st.cache_resource(show_spinner=False)
+def _output_template() -> Tuple[bytes, bytes, bytes]:
+    # Page setup and styles never change between uploads, so they are baked into one
+    # python-docx package; only the body of word/document.xml is written per upload.
     out = Document()
-    ensure_h5_subbullet_style(out)
+    ensure_output_styles(out)
 
     # Page setup
     for s in out.sections:
@@ -171,30 +409,111 @@ def transform_docx(src: Document, add_period_to_h4: bool = True) -> Tuple[Docume
     base_style.paragraph_format.space_before = Pt(0)
     base_style.paragraph_format.space_after = Pt(0)
 
-    counts = dict(H2=0, H3=0, H4=0, H5=0)
+    # The built-in list styles set contextualSpacing, which would drop the gap
+    # between consecutive bullets; the bullet roles inherit from them.
+    for name in ("List Bullet", "List Bullet 2"):
+        pPr = out.styles[name].element.pPr
+        for node in pPr.findall(qn("w:contextualSpacing")):
+            pPr.remove(node)
 
-    for para in src.paragraphs:
-        text = (para.text or "").strip()
-        if not text:
-            continue
-        level = guess_heading_level(getattr(para.style, "name", ""), text)
-        if level == 1:
-            add_heading(out, text); counts["H2"] += 1
-        elif level == 2:
-            add_subheading_all_caps(out, text); counts["H3"] += 1
-        elif level == 3:
-            add_bullet(out, text, indent=True, add_period=add_period_to_h4); counts["H4"] += 1
-        elif level == 4:
-            add_h5_bullet(out, text); counts["H5"] += 1
-        else:
-            # Ignore non-heading text
-            pass
+    bio = io.BytesIO()
+    out.save(bio)
+    with zipfile.ZipFile(bio) as zf:
+        parts = {info.filename: zf.read(info) for info in zf.infolist()}
+    # The template body holds only sectPr: paragraphs are streamed in just before it
+    document_xml = parts.pop(_DOCUMENT_PART)
+    split = document_xml.index(b"<w:sectPr")
+
+    # Every other part is identical for every upload: deflate them once into a
+    # package that each transform copies and appends word/document.xml to.
+    static = io.BytesIO()
+    with zipfile.ZipFile(static, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+    return static.getvalue(), document_xml[:split], document_xml[split:]
+
+class _BodyWriter:
+    # List-like sink for the emitters. Paragraph strings are buffered and joined
+    # into one encode + deflate write per chunk instead of one per paragraph.
+    chunk_size = 1024
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._parts = []
 
-    return out, counts
+    def append(self, xml: str):
+        self._parts.append(xml)
+        if len(self._parts) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self._stream.write(''.join(self._parts).encode("utf-8"))
+            self._parts.clear()
+
+# -----------------------------
+# Core transform
+# -----------------------------
+_COUNT_KEYS = ("H2", "H3", "H4", "H5")  # heading levels 1..4
+
+def classify_paragraphs(src) -> list:
+    # (level, text) for every non-empty heading paragraph, in document order;
+    # non-heading text is ignored on purpose (iter_source_paragraphs skips it)
+    items = []
+    for level, raw_text in iter_source_paragraphs(src):
+        text = raw_text.strip()
+        if text:
+            items.append((level, text))
+    return items
+
+def transform_docx(src, add_period_to_h4: bool = True) -> Tuple[io.BytesIO, dict]:
+    items = classify_paragraphs(src)
+    by_level = Counter(level for level, _ in items)
+    counts = {key: by_level[level] for level, key in enumerate(_COUNT_KEYS, start=1)}
+
+    # Sentence-case every H4/H5 bullet up front in one batch
+    bullets = [i for i, (level, _) in enumerate(items) if level >= 3]
+    cased = to_sentence_case_batch([items[i][1] for i in bullets])
+    for i, text in zip(bullets, cased):
+        items[i] = (items[i][0], text)
+
+    # Indexed by heading level; bullet entries take the pre-cased text
+    emitters = (
+        None,
+        add_heading,
+        add_subheading_all_caps,
+        _append_h4_bullet_with_period if add_period_to_h4 else _append_h4_bullet,
+        _append_h5_bullet,
+    )
+    static_package, body_head, body_tail = _output_template()
+    bio = io.BytesIO(static_package)
+
+    # Append mode writes over the copied central directory and rewrites it on close,
+    # so the static parts are never re-deflated.
+    with zipfile.ZipFile(bio, "a", zipfile.ZIP_DEFLATED) as zf:
+        with zf.open(_DOCUMENT_PART, "w") as stream:
+            stream.write(body_head)
+            out = _BodyWriter(stream)
+            for level, text in items:
+                emitters[level](out, text)
+            out.flush()
+            stream.write(body_tail)
+
+    bio.seek(0)
+    return bio, counts
 
 # -----------------------------
 # Streamlit UI
 # -----------------------------
+# Streamlit reruns the whole script on every widget change; memoize the transform
+# so toggling the checkbox or re-downloading doesn't reprocess the same upload.
+# The leading underscore keeps Streamlit from hashing the raw bytes itself: the
+# blake2b digest is the cache key.
+@st.cache_data(show_spinner=False, max_entries=16)
+def _transform_cached(file_digest: str, _file_bytes: bytes, add_period: bool) -> Tuple[bytes, dict]:
+    bio, counts = transform_docx(io.BytesIO(_file_bytes), add_period_to_h4=add_period)
+    return bio.getvalue(), counts
+
 st.set_page_config(page_title="Top Hits Maker", page_icon="📝", layout="centered")
 st.title("📝 Top Hits Maker")
 st.caption("Upload a .docx with Heading 2–5 structure. Get back a ‘Top Hits’ document.")
@@ -204,11 +523,10 @@ add_period_to_h4 = st.checkbox("Ensure terminal period on H4 bullets", value=Tru
 
 if uploaded is not None:
     try:
-        # Load source document
-        src_doc = Document(uploaded)
-
-        # Transform
-        out_doc, counts = transform_docx(src_doc, add_period_to_h4=add_period_to_h4)
+        # Transform (cached per upload contents + option)
+        file_bytes = uploaded.getvalue()
+        file_digest = hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+        out_bytes, counts = _transform_cached(file_digest, file_bytes, add_period_to_h4)
 
         total = sum(counts.values())
         if total == 0:
@@ -216,11 +534,6 @@ if uploaded is not None:
         else:
             st.success(f"Transformed items — H2: {counts['H2']} • H3: {counts['H3']} • H4: {counts['H4']} • H5: {counts['H5']}")
 
-            # Save to BytesIO
-            bio = io.BytesIO()
-            out_doc.save(bio)
-            bio.seek(0)
-
             # Naming logic: if input name ends with 'INPUT' (case-insensitive), change to 'OUTPUT'.
             # Otherwise, append '_OUTPUT'.
             base_name = os.path.splitext(uploaded.name)[0].rstrip()
@@ -231,7 +544,7 @@ if uploaded is not None:
 
             st.download_button(
                 label="⬇️ Download reformatted .docx",
-                data=bio,
+                data=out_bytes,
                 file_name=out_name,
                 mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             )
@@ -0,0 +1,26 @@
+import io
+import os
+import sys
+import tempfile
+
+import pytest
+from docx import Document
+
+# app.py is a Streamlit script, not a package; importing it runs the UI in bare mode
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Numba's on-disk cache records the importing module's name; kernels compiled under
+# "app" here must not land in the __pycache__ that `streamlit run` (__main__) loads.
+os.environ.setdefault("NUMBA_CACHE_DIR", tempfile.mkdtemp(prefix="numba-cache-"))
+
+
+@pytest.fixture
+def make_docx():
+    # Build a .docx in memory; `build` gets a fresh python-docx Document to fill in
+    def _make(build) -> io.BytesIO:
+        doc = Document()
+        build(doc)
+        bio = io.BytesIO()
+        doc.save(bio)
+        bio.seek(0)
+        return bio
+    return _make
@@ -0,0 +1,174 @@
+import io
+import zipfile
+
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+import app
+
+
+def _add_runs(doc, style, runs_xml):
+    p = doc.add_paragraph(style=style)
+    p._p.append(parse_xml("<w:r %s>%s</w:r>" % (nsdecls("w"), runs_xml)))
+
+
+def _original_heading_level(style_name: str) -> int:
+    # The classification rule of the original guess_heading_level
+    style = (style_name or "").lower().strip()
+    if "heading 2" in style or style == "h2":
+        return 1
+    elif "heading 3" in style or style == "h3":
+        return 2
+    elif "heading 4" in style or style == "h4":
+        return 3
+    elif "heading 5" in style or style == "h5":
+        return 4
+    return 0
+
+
+def _expected(src):
+    # What the python-docx based reader saw: (level, text) for body heading paragraphs
+    src.seek(0)
+    paras = Document(src).paragraphs
+    src.seek(0)
+    return [(_original_heading_level(p.style.name), p.text) for p in paras
+            if _original_heading_level(p.style.name)]
+
+
+def _rename_parts(src, renames, rewrites):
+    # Copy of the package with parts moved; `rewrites` are applied to the _rels
+    # parts and [Content_Types].xml so they point at the new names
+    out = io.BytesIO()
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            data = zin.read(info)
+            name = info.filename
+            if name.endswith(".rels") or name == "[Content_Types].xml":
+                for old, new in rewrites:
+                    data = data.replace(old.encode(), new.encode())
+            zout.writestr(renames.get(name, name), data)
+    out.seek(0)
+    return out
+
+
+def test_run_breaks_tabs_and_hyphens_match_python_docx(make_docx):
+    def build(doc):
+        _add_runs(doc, "Heading 4", "<w:t>alpha</w:t><w:tab/><w:t>beta</w:t><w:br/><w:t>gamma</w:t>")
+        doc.add_paragraph("Tab\there", style="Heading 2")
+        _add_runs(doc, "Heading 3", "<w:t>one</w:t><w:cr/><w:t>two</w:t><w:ptab w:relativeTo=\"margin\" "
+                                    "w:alignment=\"right\" w:leader=\"none\"/><w:t>three</w:t>")
+        _add_runs(doc, "Heading 5", "<w:t>well</w:t><w:noBreakHyphen/><w:t>known</w:t>"
+                                    "<w:br w:type=\"page\"/><w:t>after page</w:t>")
+
+    src = make_docx(build)
+    got = list(app.iter_source_paragraphs(src))
+    assert got == [
+        (3, "alpha\tbeta\ngamma"),
+        (1, "Tab\there"),
+        (2, "one\ntwo\tthree"),
+        (4, "well-knownafter page"),
+    ]
+    assert got == _expected(src)
+
+
+def test_parts_are_found_through_relationships(make_docx):
+    def build(doc):
+        doc.add_paragraph("Intro", style="Heading 2")
+        doc.add_paragraph("Body text")
+        doc.add_paragraph("A point", style="Heading 4")
+
+    src = _rename_parts(make_docx(build), {
+        "word/document.xml": "word/main.xml",
+        "word/_rels/document.xml.rels": "word/_rels/main.xml.rels",
+        "word/styles.xml": "word/wordStyles.xml",
+    }, [
+        ("word/document.xml", "word/main.xml"),         # _rels/.rels, content types
+        ("word/styles.xml", "word/wordStyles.xml"),     # content types
+        ('Target="styles.xml"', 'Target="wordStyles.xml"'),  # relative to word/
+    ])
+    with zipfile.ZipFile(src) as zf:
+        assert "word/document.xml" not in zf.namelist()
+        assert "word/styles.xml" not in zf.namelist()
+    got = list(app.iter_source_paragraphs(src))
+    assert got == [(1, "Intro"), (3, "A point")]
+    assert got == _expected(src)
+
+
+def test_table_cell_paragraphs_are_skipped(make_docx):
+    def build(doc):
+        doc.add_paragraph("Before", style="Heading 2")
+        table = doc.add_table(rows=2, cols=2)
+        table.cell(0, 0).paragraphs[0].text = "In a cell"
+        table.cell(0, 0).paragraphs[0].style = doc.styles["Heading 4"]
+        inner = table.cell(1, 1).add_table(rows=1, cols=1)
+        inner.cell(0, 0).add_paragraph("Nested cell", style="Heading 3")
+        doc.add_paragraph("After", style="Heading 4")
+
+    src = make_docx(build)
+    got = list(app.iter_source_paragraphs(src))
+    assert got == [(1, "Before"), (3, "After")]
+    assert got == _expected(src)
+
+
+def test_hyperlink_runs_are_read(make_docx):
+    def build(doc):
+        p = doc.add_paragraph("See ", style="Heading 4")
+        p._p.append(parse_xml(
+            '<w:hyperlink %s r:id="rId99"><w:r><w:t xml:space="preserve">the </w:t></w:r>'
+            '<w:r><w:t>link</w:t></w:r></w:hyperlink>' % nsdecls("w", "r")))
+        p.add_run(" here")
+
+    src = make_docx(build)
+    got = list(app.iter_source_paragraphs(src))
+    assert got == [(3, "See the link here")]
+    assert got == _expected(src)
+
+
+def test_unknown_or_missing_style_falls_back_to_default(make_docx):
+    def build(doc):
+        # Make Heading 3 the default paragraph style so the fallback is visible
+        doc.styles["Normal"].element.set(qn("w:default"), "0")
+        doc.styles["Heading 3"].element.set(qn("w:default"), "1")
+        doc.add_paragraph("No style")
+        doc.add_paragraph("Heading 5", style="Heading 5")
+        doc.add_paragraph("Unknown style", style="Heading 2")._p.style = "NoSuchStyle"
+
+    src = make_docx(build)
+    got = list(app.iter_source_paragraphs(src))
+    assert got == [(2, "No style"), (4, "Heading 5"), (2, "Unknown style")]
+    assert got == _expected(src)
+
+
+def test_empty_headings_are_yielded_then_dropped(make_docx):
+    def build(doc):
+        doc.add_paragraph("", style="Heading 2")
+        doc.add_paragraph("   ", style="Heading 4")
+        _add_runs(doc, "Heading 5", "<w:br/>")
+        doc.add_paragraph("Kept", style="Heading 3")
+
+    src = make_docx(build)
+    got = list(app.iter_source_paragraphs(src))
+    assert got == [(1, ""), (3, "   "), (4, "\n"), (2, "Kept")]
+    assert got == _expected(src)
+    src.seek(0)
+    assert app.classify_paragraphs(src) == [(2, "Kept")]
+
+
+def test_custom_named_heading_styles_are_detected(make_docx):
+    def build(doc):
+        for name in ("Heading 2 Custom", "KP Heading 4", "Heading 5 Alt", "H3", "Not A Heading"):
+            doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        doc.add_paragraph("Custom two", style="Heading 2 Custom")
+        doc.add_paragraph("Custom four", style="KP Heading 4")
+        doc.add_paragraph("Custom five", style="Heading 5 Alt")
+        doc.add_paragraph("Short three", style="H3")
+        doc.add_paragraph("Ignored", style="Not A Heading")
+
+    src = make_docx(build)
+    got = list(app.iter_source_paragraphs(src))
+    assert got == [(1, "Custom two"), (3, "Custom four"), (4, "Custom five"), (2, "Short three")]
+    assert got == _expected(src)
+    _, counts = app.transform_docx(src)
+    assert counts == {"H2": 1, "H3": 1, "H4": 1, "H5": 1}
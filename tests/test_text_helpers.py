@@ -0,0 +1,139 @@
+import os
+import random
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+import app
+
+
+def _original_to_sentence_case(text: str) -> str:
+    # to_sentence_case as first shipped: the reference for the faster versions
+    s = (text or "")
+    lowered = ''.join(ch.lower() if ch.isalpha() else ch for ch in s)
+    chars = list(lowered)
+    n = len(chars)
+    cap_next = True
+    i = 0
+    while i < n:
+        ch = chars[i]
+        if cap_next and ch.isalpha():
+            chars[i] = ch.upper()
+            cap_next = False
+        elif ch in ('.', '!', '?', ':'):
+            cap_next = True
+        i += 1
+    return ''.join(chars)
+
+
+@pytest.fixture(params=["numba", "python"])
+def to_sentence_case(request, monkeypatch):
+    # Run each case through the ASCII Numba kernel (when installed) and the pure path
+    if request.param == "python":
+        monkeypatch.setattr(app, "_sentence_case_u8", None)
+    elif app._sentence_case_u8 is None:
+        pytest.skip("numba not installed")
+    return app.to_sentence_case
+
+
+CASES = [
+    "",
+    "HELLO WORLD",
+    "2008: COLYER said he would forbid it. that would allow LGBTQ couples",
+    # closing quotes and brackets between a mark and the next letter
+    'He said "STOP." then LEFT',
+    "She asked 'why?' and WAITED",
+    "“Done.” next ITEM",
+    "It’s “fine!” REALLY: ok",
+    '("Quoted.") after',
+    "...leading marks",
+    "a.b.c!d?e:f",
+    "trailing mark.",
+    "12 MONTHS. 3 YEARS",
+    "don’t STOP",
+    # letters str.isalpha() accepts but ASCII doesn't
+    "ÉCOLE. ÜBER straße",
+    "ΟΔΟΣ ΚΑΙ ΣΟΦΙΑ. ΣΣ",
+    "İSTANBUL. İZMIR",
+    # numerics [^\W\d_] matches that are not letters
+    "x. ² abc",
+    "x. ½ abc",
+    "ⅻ hello",
+    "Ⅻ. ⓐⒷ NEXT",
+]
+
+
+@pytest.mark.parametrize("text", CASES)
+def test_to_sentence_case_matches_original(to_sentence_case, text):
+    assert to_sentence_case(text) == _original_to_sentence_case(text)
+
+
+def test_to_sentence_case_random_matches_original(to_sentence_case):
+    rng = random.Random(0)
+    alphabet = "aBcZ éÉüß İΣσς ²½Ⅻⓐ .!?: \"'”’() 12_-—\t\n"
+    for _ in range(20000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+        assert to_sentence_case(text) == _original_to_sentence_case(text), repr(text)
+
+
+def test_to_sentence_case_batch_matches_single():
+    rng = random.Random(1)
+    alphabet = "aBcZ é .!?: \"’ 12"
+    texts = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+             for _ in range(app._BATCH_MIN * 2)]
+    assert app.to_sentence_case_batch(texts) == [_original_to_sentence_case(t) for t in texts]
+
+
+
+def test_to_sentence_case_batch_from_threads_under_workqueue():
+    # Streamlit sessions run on their own threads; concurrent parallel launches on
+    # Numba's workqueue layer abort the interpreter, so run it in a subprocess.
+    if app._sentence_case_u8_batch is None:
+        pytest.skip("numba not installed")
+    script = textwrap.dedent("""
+        import random, sys, threading
+        sys.path.insert(0, %r)
+        import app
+        rng = random.Random(2)
+        texts = ["".join(rng.choice("aBc .!?:12") for _ in range(40)) for _ in range(5000)]
+        expected = [app.to_sentence_case(t) for t in texts]
+        failures = []
+        def work():
+            for _ in range(10):
+                if app.to_sentence_case_batch(texts) != expected:
+                    failures.append(1)
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        sys.exit(1 if failures else 0)
+    """ % os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, NUMBA_THREADING_LAYER="workqueue")
+    proc = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+def test_lower_diff_class_is_complete():
+    # Exactly the characters where str.lower() differs from lowering letter by letter
+    expected = {"Σ"} | {
+        c for c in map(chr, range(sys.maxunicode + 1))
+        if not c.isalpha() and c.lower() != c
+    }
+    found = {c for c in map(chr, range(sys.maxunicode + 1)) if app._LOWER_DIFF_RE.match(c)}
+    assert found == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Point", "Point."),
+    ("Point.  ", "Point."),
+    ("Really?", "Really?"),
+    ('He said "stop."', 'He said "stop."'),
+    ('He said "stop"', 'He said "stop."'),
+    ("It was ‘fine’", "It was ‘fine.’"),
+    ("“Done!”", "“Done!”"),
+    ("", ""),
+])
+def test_ensure_terminal_period_closing_quotes(text, expected):
+    assert app.ensure_terminal_period(text) == expected
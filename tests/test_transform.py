@@ -0,0 +1,31 @@
+from docx import Document
+from docx.oxml.ns import qn
+
+import app
+
+
+def _run_content(r):
+    # (tag, text, xml:space) for each child of a w:r, ignoring rPr
+    return [(c.tag, c.text, c.get(qn("xml:space"))) for c in r if c.tag != qn("w:rPr")]
+
+
+def _reference_run(text):
+    # The run python-docx's add_run(text) writes, as the original app did
+    return Document().add_paragraph().add_run(text)._r
+
+
+def test_tabs_and_breaks_round_trip_as_run_elements(make_docx):
+    def build(doc):
+        doc.add_paragraph("Tab\there", style="Heading 2")
+        doc.add_paragraph("one\ntwo", style="Heading 3")
+        doc.add_paragraph("ALPHA \tBETA\nGAMMA", style="Heading 4")
+        doc.add_paragraph("a < b & c\td", style="Heading 5")
+
+    out, counts = app.transform_docx(make_docx(build), add_period_to_h4=True)
+    assert counts == {"H2": 1, "H3": 1, "H4": 1, "H5": 1}
+    paras = Document(out).paragraphs
+    expected = ["TAB\tHERE", "ONE\nTWO", "Alpha \tbeta\ngamma.", "A < b & c\td."]
+    assert [p.text for p in paras] == expected
+    for p, text in zip(paras, expected):
+        (r,) = p._p.r_lst
+        assert _run_content(r) == _run_content(_reference_run(text))